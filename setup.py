@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-from setuptools import setup
+from setuptools import Extension, setup
 
 # To use a consistent encoding
 from codecs import open
@@ -20,6 +20,23 @@ with open(path.join(here, "README.md"), encoding="utf-8") as f:
 with open(path.join(here, "CHANGELOG.md"), encoding="utf-8") as f:
     history = f.read()
 
+# optionally build the compiled SI kernel; the package works without it,
+# falling back to the NumPy implementation
+try:
+    from Cython.Build import cythonize
+
+    ext_modules = cythonize(
+        [
+            Extension(
+                "siti_tools._sobel",
+                sources=["siti_tools/_sobel.pyx"],
+                extra_compile_args=["-O3", "-ffast-math"],
+            )
+        ]
+    )
+except ImportError:
+    ext_modules = []
+
 setup(
     name="siti-tools",
     version=version,
@@ -30,6 +47,7 @@ setup(
     author_email="werner.robitza@gmail.com",
     url="https://github.com/VQEG/siti-tools",
     packages=["siti_tools"],
+    ext_modules=ext_modules,
     include_package_data=True,
     install_requires=["scipy", "numpy", "av", "tqdm", "plotille"],
     license="MIT",
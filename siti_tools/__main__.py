@@ -25,15 +25,23 @@
 # SOFTWARE.
 
 import argparse
+import csv
 import json
 import logging
 import sys
-from tqdm import tqdm
+
+try:
+    # considerably faster than stdlib json for result dumps with many floats
+    import orjson
+except ImportError:
+    orjson = None
+
 from . import __version__ as prog_version
 from .log import CustomLogFormatter
 from .siti import (
     CalculationDomain,
     ColorRange,
+    Device,
     EotfFunction,
     HdrMode,
     Pu21Mode,
@@ -85,7 +93,19 @@ def setup_logger(level: int = logging.INFO):
     return logger
 
 
-def main():
+def _run_one(input_file: str, calculator_kwargs: dict, num_frames=0, hwaccel=None) -> dict:
+    """
+    Run a fresh SiTiCalculator on one input file and return its results.
+
+    Used as the worker function for --inputs-file mode, hence module-level
+    so that it can be pickled by joblib/loky.
+    """
+    si_ti_calculator = SiTiCalculator(**calculator_kwargs)
+    si_ti_calculator.calculate(input_file, num_frames=num_frames, hwaccel=hwaccel)
+    return si_ti_calculator.get_results()
+
+
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="siti-tools",
         description=f"siti-tools v{prog_version}",
@@ -97,6 +117,19 @@ def main():
         "input",
         help="Input file, can be Y4M or file in FFmpeg-readable container",
         type=str,
+        nargs="?",
+    )
+    group_io.add_argument(
+        "--inputs-file",
+        help="Path to a file with one input path per line; all inputs are processed "
+        "in parallel and results are printed as one JSON object per line",
+        type=str,
+    )
+    group_io.add_argument(
+        "--n-jobs",
+        help="Number of parallel jobs for --inputs-file mode, -1 means all cores",
+        type=int,
+        default=-1,
     )
     group_io.add_argument(
         "-s",
@@ -123,6 +156,18 @@ def main():
         choices=["json", "csv"],
         default="json",
     )
+    group_io.add_argument(
+        "--hwaccel",
+        help="Hardware acceleration device type for decoding, e.g. 'cuda' for NVDEC; "
+        "falls back to software decoding if unavailable",
+        type=str,
+    )
+    group_io.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print one record per frame to stdout as soon as it is calculated, "
+        "instead of a final summary (implies --quiet)",
+    )
     group_io.add_argument(
         "-v", "--verbose", action="store_true", help="Show debug info on stderr"
     )
@@ -171,6 +216,18 @@ def main():
         choices=list(ColorRange),
         default=SiTiCalculator.DEFAULT_COLOR_RANGE,
     )
+    group_general.add_argument(
+        "--jit",
+        help="Use Numba-compiled kernels for the SI calculation (requires numba)",
+        action="store_true",
+    )
+    group_general.add_argument(
+        "--device",
+        help="Run the SI calculation on the CPU or on a CUDA GPU (requires cupy)",
+        type=Device,
+        choices=list(Device),
+        default=Device.CPU,
+    )
     group_general.add_argument(
         "--legacy",
         help="Use legacy mode, disables all other features except for range adjustment",
@@ -217,10 +274,64 @@ def main():
         default=SiTiCalculator.DEFAULT_PU21_MODE,
     )
 
-    cli_args = parser.parse_args()
+    return parser
+
+
+# built once at import time, so repeated main() calls (e.g. from shell loops
+# driving the console entry point) do not re-run ~20 add_argument calls
+_PARSER = _build_parser()
+
+
+def main():
+    cli_args = _PARSER.parse_args()
 
     setup_logger(logging.DEBUG if cli_args.verbose else logging.INFO)
 
+    if cli_args.input is None and cli_args.inputs_file is None:
+        _PARSER.error("either an input file or --inputs-file is required")
+
+    calculator_kwargs = dict(
+        calculation_domain=cli_args.calculation_domain,
+        hdr_mode=cli_args.hdr_mode,
+        bit_depth=cli_args.bit_depth,
+        color_range=cli_args.color_range,
+        eotf_function=cli_args.eotf_function,
+        l_max=cli_args.l_max,
+        l_min=cli_args.l_min,
+        gamma=cli_args.gamma,
+        pu21_mode=cli_args.pu21_mode,
+        verbose=cli_args.verbose,
+        show_histogram=cli_args.show_histogram,
+        legacy=cli_args.legacy,
+        jit=cli_args.jit,
+        device=cli_args.device,
+    )
+
+    if cli_args.inputs_file is not None:
+        # batch mode: each video is independent, so fan the files out to a
+        # process pool and print one JSON object per line as results arrive
+        if cli_args.settings:
+            raise RuntimeError("--settings cannot be combined with --inputs-file")
+        try:
+            from joblib import Parallel, delayed
+        except ImportError:
+            raise RuntimeError(
+                "joblib is required for --inputs-file mode, install it via 'pip install joblib'"
+            )
+
+        with open(cli_args.inputs_file, "r") as f:
+            input_files = [line.strip() for line in f if line.strip()]
+
+        all_results = Parallel(n_jobs=cli_args.n_jobs, backend="loky")(
+            delayed(_run_one)(
+                input_file, calculator_kwargs, cli_args.num_frames, cli_args.hwaccel
+            )
+            for input_file in input_files
+        )
+        for results in all_results:
+            print(json.dumps(results))
+        return
+
     if cli_args.settings:
         # read existing settings from output file
         with open(cli_args.settings, "r") as results_file:
@@ -253,22 +364,35 @@ def main():
 
             si_ti_calculator = SiTiCalculator.from_settings(settings)
     else:
-        si_ti_calculator = SiTiCalculator(
-            calculation_domain=cli_args.calculation_domain,
-            hdr_mode=cli_args.hdr_mode,
-            bit_depth=cli_args.bit_depth,
-            color_range=cli_args.color_range,
-            eotf_function=cli_args.eotf_function,
-            l_max=cli_args.l_max,
-            l_min=cli_args.l_min,
-            gamma=cli_args.gamma,
-            pu21_mode=cli_args.pu21_mode,
-            verbose=cli_args.verbose,
-            show_histogram=cli_args.show_histogram,
-            legacy=cli_args.legacy,
-        )
+        si_ti_calculator = SiTiCalculator(**calculator_kwargs)
+
+    if cli_args.stream:
+        # write each frame's record as soon as it is available, so peak memory
+        # stays flat and downstream tools can consume results line by line
+        if cli_args.format == "csv":
+            stream_writer = csv.DictWriter(sys.stdout, fieldnames=["n", "si", "ti"])
+            stream_writer.writeheader()
+
+            def stream_callback(si_value, ti_value, frame_number):
+                stream_writer.writerow(
+                    {"n": frame_number, "si": si_value, "ti": ti_value}
+                )
+                sys.stdout.flush()
+
+        else:
+
+            def stream_callback(si_value, ti_value, frame_number):
+                print(
+                    json.dumps({"n": frame_number, "si": si_value, "ti": ti_value}),
+                    flush=True,
+                )
+
+        si_ti_calculator.add_frame_callback(stream_callback)
+
+    if not cli_args.quiet and not cli_args.stream:
+        # deferred so that library users and quiet runs do not pay for it
+        from tqdm import tqdm
 
-    if not cli_args.quiet:
         # render the maximum in the progress bar, rather than just an iterator
         overall_max_frames = max(
             cli_args.num_frames if cli_args.num_frames is not None else 0,
@@ -284,14 +408,26 @@ def main():
     si_ti_calculator.calculate(
         cli_args.input,
         num_frames=cli_args.num_frames,
+        hwaccel=cli_args.hwaccel,
     )
 
+    if cli_args.stream:
+        # per-frame records were already written by the callback
+        return
+
     if cli_args.format == "json":
         results = si_ti_calculator.get_results()
-        print(json.dumps(results, indent=4))
+        if orjson is not None:
+            sys.stdout.buffer.write(
+                orjson.dumps(
+                    results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                )
+                + b"\n"
+            )
+        else:
+            print(json.dumps(results, indent=4))
     elif cli_args.format == "csv":
-        results = si_ti_calculator.get_csv_results()
-        print(results)
+        si_ti_calculator.get_csv_results(file=sys.stdout)
     else:
         raise RuntimeError(f"No such format {cli_args.format}")
 
@@ -0,0 +1,158 @@
+# This file is part of siti_tools
+#
+# MIT License
+#
+# siti_tools, Copyright (c) 2021 Werner Robitza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Optional Numba-compiled kernels for the SI/TI hot loops.
+
+These fuse the Sobel convolutions, gradient magnitude and standard deviation
+into a single pass over the frame, avoiding the intermediate full-frame arrays
+that the plain NumPy implementation allocates. Numba is an optional
+dependency; import this module only after checking :data:`HAS_NUMBA`.
+"""
+
+import math
+
+import numpy as np
+
+try:
+    import numba
+
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+if HAS_NUMBA:
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def si_frame(frame_data) -> float:
+        """
+        Fused SI kernel: Sobel in both axes, gradient magnitude and standard
+        deviation in one pass over the frame.
+
+        Numerically equivalent to
+        ``np.hypot(sobel(f, axis=0), sobel(f, axis=1))[1:-1, 1:-1].std()``.
+
+        Args:
+            frame_data: 2D array of input frame data
+
+        Returns:
+            float: SI
+        """
+        h, w = frame_data.shape
+        total = 0.0
+        total_sq = 0.0
+        for i in numba.prange(1, h - 1):
+            for j in range(1, w - 1):
+                tl = float(frame_data[i - 1, j - 1])
+                tc = float(frame_data[i - 1, j])
+                tr = float(frame_data[i - 1, j + 1])
+                ml = float(frame_data[i, j - 1])
+                mr = float(frame_data[i, j + 1])
+                bl = float(frame_data[i + 1, j - 1])
+                bc = float(frame_data[i + 1, j])
+                br = float(frame_data[i + 1, j + 1])
+                # derivative along one axis, [1, 2, 1] smoothing along the other,
+                # same weights as scipy.ndimage.sobel
+                gx = (bl - tl) + 2.0 * (bc - tc) + (br - tr)
+                gy = (tr - tl) + 2.0 * (mr - ml) + (br - bl)
+                magnitude = math.sqrt(gx * gx + gy * gy)
+                total += magnitude
+                total_sq += magnitude * magnitude
+        n = (h - 2) * (w - 2)
+        mean = total / n
+        return math.sqrt(total_sq / n - mean * mean)
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def ti_frame(frame_data, previous_frame_data) -> float:
+        """
+        Fused TI kernel: standard deviation of the frame difference as a
+        single-pass reduction, without allocating the difference array.
+
+        Numerically equivalent to ``(frame_data - previous_frame_data).std()``.
+
+        Args:
+            frame_data: 2D array of current frame data
+            previous_frame_data: 2D array of previous frame data, must be of same size as current frame
+
+        Returns:
+            float: TI
+        """
+        h, w = frame_data.shape
+        total = 0.0
+        total_sq = 0.0
+        for i in numba.prange(h):
+            for j in range(w):
+                diff = float(frame_data[i, j]) - float(previous_frame_data[i, j])
+                total += diff
+                total_sq += diff * diff
+        n = h * w
+        mean = total / n
+        return math.sqrt(total_sq / n - mean * mean)
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def sdr_pq_bt1886(
+        frame_data, gamma: float, l_min: float, l_max: float
+    ) -> np.ndarray:
+        """
+        Fused SDR transform: BT.1886 EOTF, display scaling and PQ OETF in one
+        pass over the frame.
+
+        Equivalent to ``oetf_pq(apply_display_model(frame_data,
+        EotfFunction.BT1886, l_max, l_min, gamma))`` for full-range input in
+        [0, 1], except that out-of-range values are truncated silently instead
+        of logging a warning.
+
+        Args:
+            frame_data: pixel values expected in the range [0, 1]
+            gamma: BT.1886 exponent
+            l_min: display luminance for black in cd/m2
+            l_max: display peak luminance in cd/m2
+
+        Returns:
+            np.ndarray: pixel values in the PQ domain, range [0, 1]
+        """
+        h, w = frame_data.shape
+        out = np.empty((h, w), dtype=np.float64)
+        # PQ constants from ITU-R Rec. BT.2100, as in oetf_pq
+        m = 78.84375
+        n = 0.1593017578125
+        c1 = 0.8359375
+        c2 = 18.8515625
+        c3 = 18.6875
+        lm1 = 10000.0 ** n
+        luminance_range = l_max - l_min
+        for i in numba.prange(h):
+            for j in range(w):
+                v = frame_data[i, j]
+                if v < 0.0:
+                    v = 0.0
+                elif v > 1.0:
+                    v = 1.0
+                # eotf_1886 with l_min=0, l_max=1 reduces to a pure power law
+                # (a = 1, b = 0); the display mapping happens right after
+                v = luminance_range * v ** gamma + l_min
+                lm2 = v ** n
+                out[i, j] = ((c1 * lm1 + c2 * lm2) / (lm1 + c3 * lm2)) ** m
+        return out
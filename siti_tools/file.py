@@ -22,15 +22,88 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from typing import Generator
-import numpy as np
-import av
 import logging
+import queue
+import threading
+from typing import Generator, Iterable, Iterator, Optional
+
+import av
+import numpy as np
 
 logger = logging.getLogger("siti")
 
+_SENTINEL = object()
+
 
-def read_container(input_file: str) -> Generator[np.ndarray, None, None]:
+def prefetch_frames(
+    frames: Iterable[np.ndarray], maxsize: int = 4
+) -> Iterator[np.ndarray]:
+    """
+    Run a frame generator in a background thread, buffering up to ``maxsize``
+    frames ahead of the consumer.
+
+    This overlaps PyAV decoding with the SI/TI computation: PyAV releases the
+    GIL while decoding, and NumPy releases it for bulk operations, so a plain
+    thread is enough to hide whichever stage is shorter.
+
+    Args:
+        frames (Iterable[np.ndarray]): the frame generator to wrap
+        maxsize (int): number of frames to decode ahead. Defaults to 4.
+
+    Yields:
+        np.ndarray: the frame data, in producer order
+    """
+    frame_queue: queue.Queue = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def _put(item) -> bool:
+        # a plain blocking put would deadlock the producer if the consumer
+        # stops early (num_frames reached, exception, generator closed), so
+        # poll the stop event while the queue is full
+        while not stop.is_set():
+            try:
+                frame_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _producer():
+        try:
+            try:
+                for frame in frames:
+                    if not _put(frame):
+                        return
+            except BaseException as e:  # re-raised on the consumer side
+                _put(e)
+            else:
+                _put(_SENTINEL)
+        finally:
+            # close the wrapped generator so its decoder resources are
+            # released as soon as the producer exits, not at GC time
+            close = getattr(frames, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=_producer, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item = frame_queue.get()
+            if item is _SENTINEL:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def read_container(
+    input_file: str, hwaccel: Optional[str] = None
+) -> Generator[np.ndarray, None, None]:
     """
     Read a multiplexed file via ffmpeg and yield the per-frame Y data.
 
@@ -40,6 +113,9 @@ def read_container(input_file: str) -> Generator[np.ndarray, None, None]:
 
     Args:
         input_file (str): Input file path
+        hwaccel (str, optional): Hardware acceleration device type to decode
+            with, e.g. "cuda" for NVDEC. Falls back to software decoding if the
+            device is unavailable. Defaults to None (software decoding).
 
     Raises:
         RuntimeError: If no video streams were found or decoding was not possible
@@ -47,7 +123,22 @@ def read_container(input_file: str) -> Generator[np.ndarray, None, None]:
     Yields:
         np.ndarray: The frame data, integer
     """
-    container = av.open(input_file)
+    if hwaccel is not None:
+        try:
+            from av.codec.hwaccel import HWAccel
+
+            container = av.open(
+                input_file,
+                hwaccel=HWAccel(device_type=hwaccel, allow_software_fallback=True),
+            )
+        except ImportError:
+            logger.warning(
+                f"This version of PyAV does not support hardware acceleration, "
+                f"ignoring hwaccel={hwaccel}"
+            )
+            container = av.open(input_file)
+    else:
+        container = av.open(input_file)
 
     if not len(container.streams.video):
         raise RuntimeError("No video streams found!")
@@ -61,21 +152,35 @@ def read_container(input_file: str) -> Generator[np.ndarray, None, None]:
 
         if "p10" in str(frame.format.name):
             datatype = np.uint16
+            # 10/12-bit values and their Sobel responses fit comfortably into int32
+            signed_datatype = np.int32
         elif "p12" in str(frame.format.name):
             datatype = np.uint16
+            signed_datatype = np.int32
         else:
             datatype = np.uint8
+            # 8-bit values need int16 at most for signed arithmetic; using plain
+            # "int" (int64) would move 8x the memory through the cache per frame
+            signed_datatype = np.int16
 
         try:
+            # The code commented out below does the "standard" conversion of YUV
+            # to grey, using weighting, but it does not actually use the correct
+            # luminance-only Y values.
+            # frame.to_ndarray(format="gray")
+
+            # choose the Y plane (the first one); note that the plane is stored
+            # with a padded line size, which may be larger than the visible
+            # width, so reshape by the stride and crop to the actual width
+            plane = frame.planes[0]
+            stride = plane.line_size // np.dtype(datatype).itemsize
             yield (
-                # The code commented out below does the "standard" conversion of YUV
-                # to grey, using weighting, but it does not actually use the correct
-                # luminance-only Y values.
-                # frame.to_ndarray(format="gray")
-
-                # choose the Y plane (the first one)
-                np.frombuffer(frame.planes[0], datatype)
-                .reshape(frame.height, frame.width).astype("int")
+                # go through the buffer protocol so the FFmpeg plane memory is
+                # wrapped without an intermediate bytes copy
+                np.asarray(memoryview(plane))
+                .view(datatype)[: stride * frame.height]
+                .reshape(frame.height, stride)[:, : frame.width]
+                .astype(signed_datatype, copy=False)
             )
         except ValueError as e:
             raise RuntimeError(
@@ -25,14 +25,14 @@
 import csv
 import io
 import logging
+import math
 import os
-import plotille
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple, Union, Callable, cast
-from scipy import ndimage
 from enum import Enum
 import numpy as np
 
-from .file import read_container
+from .file import prefetch_frames, read_container
 from . import __version__ as version
 
 logger = logging.getLogger("siti")
@@ -87,6 +87,15 @@ class Pu21Mode(EnumArg):
     PEAKS_GLARE = "peaks_glare"
 
 
+class Device(EnumArg):
+    """
+    Device to run the SI calculation on
+    """
+
+    CPU = "cpu"
+    CUDA = "cuda"
+
+
 class SiTiCalculator:
     DEFAULT_HDR_MODE = HdrMode.SDR
     DEFAULT_BIT_DEPTH = 8  # or 10, 12
@@ -103,6 +112,68 @@ class SiTiCalculator:
     LIMITED_RANGE_MIN = 16 / 255
     LIMITED_RANGE_MAX = 235 / 255
 
+    # number of rows per Sobel tile, chosen so that the working set of one
+    # strip (input, two gradients, magnitude) stays cache-resident for typical
+    # widths; frames at most this tall are processed in one piece
+    SI_TILE_ROWS = 256
+
+    # PU21 fit parameters per mode, from https://github.com/gfxdisp/pu21:
+    # (p coefficients, p_min, p_max)
+    PU21_PARAMS = {
+        Pu21Mode.BANDING: (
+            [
+                1.070275272,
+                0.4088273932,
+                0.153224308,
+                0.2520326168,
+                1.063512885,
+                1.14115047,
+                521.4527484,
+            ],
+            -1.5580e-07,
+            520.4673,
+        ),
+        Pu21Mode.BANDING_GLARE: (
+            [
+                0.353487901,
+                0.3734658629,
+                8.277049286e-05,
+                0.9062562627,
+                0.09150303166,
+                0.9099517204,
+                596.3148142,
+            ],
+            5.4705e-10,
+            595.3939,
+        ),
+        Pu21Mode.PEAKS: (
+            [
+                1.043882782,
+                0.6459495343,
+                0.3194584211,
+                0.374025247,
+                1.114783422,
+                1.095360363,
+                384.9217577,
+            ],
+            1.3674e-07,
+            380.9853,
+        ),
+        Pu21Mode.PEAKS_GLARE: (
+            [
+                816.885024,
+                1479.463946,
+                0.001253215609,
+                0.9329636822,
+                0.06746643971,
+                1.573435413,
+                419.6006374,
+            ],
+            -9.7360e-08,
+            407.5066,
+        ),
+    }
+
     @staticmethod
     def from_settings(settings: Dict):
         return SiTiCalculator(**settings)
@@ -121,6 +192,8 @@ class SiTiCalculator:
         verbose=False,
         show_histogram=False,
         legacy=False,
+        jit=False,
+        device: Device = Device.CPU,
     ):
         """
         Create a new SI/TI calculator
@@ -138,10 +211,58 @@ class SiTiCalculator:
             verbose (bool, optional): Show verbose logging for the first frame.
             show_histogram (bool, optional): Show a histogram for the first frame (computation-intensive, implies verbose=True).
             legacy (bool, optional): Use legacy SI/TI calculation. Defaults to False.
+            jit (bool, optional): Use Numba-compiled kernels for the SI calculation. Requires numba to be installed. Defaults to False.
+            device (Device, optional): Run the SI calculation on the CPU or on a CUDA GPU. The CUDA backend requires cupy to be installed. Defaults to CPU.
         """
         self.verbose = verbose
         self.show_histogram = show_histogram
         self.legacy = legacy
+        self.jit = jit
+        self.device = device
+
+        if self.jit and self.device == Device.CUDA:
+            raise RuntimeError("jit=True cannot be combined with device=cuda, choose one")
+
+        self.ti_function: Callable = self._ti_buffered
+        self._ti_diff_buffer: Optional[np.ndarray] = None
+
+        if self.device == Device.CUDA:
+            try:
+                import cupy  # noqa: F401
+                import cupyx.scipy.ndimage  # noqa: F401
+            except ImportError:
+                raise RuntimeError(
+                    "cupy is required for device=cuda, install it via 'pip install cupy'"
+                )
+            self.si_function: Callable[[np.ndarray], float] = self._si_cuda
+            self.ti_function = self._ti_cuda
+            # two-slot cache of device copies, so SI and TI share one upload
+            # per frame and the previous frame stays resident for TI
+            self._gpu_frames: List[Tuple[np.ndarray, object]] = []
+        elif self.jit:
+            from . import _kernels_numba
+
+            if not _kernels_numba.HAS_NUMBA:
+                raise RuntimeError(
+                    "numba is required for jit=True, install it via 'pip install numba'"
+                )
+            self.si_function = _kernels_numba.si_frame
+            self.ti_function = _kernels_numba.ti_frame
+            # compile the kernels here, on the main thread: numba initializes
+            # its threading layer on first call, and doing that from the SI
+            # worker thread can hang interpreter shutdown (e.g. with tbb)
+            warmup = np.zeros((3, 3), dtype=np.float32)
+            self.si_function(warmup)
+            self.ti_function(warmup, warmup)
+        else:
+            try:
+                # compiled kernel, built by setup.py when Cython was available
+                from . import _sobel  # noqa: F401
+
+                self.si_function = self._si_compiled
+                self.ti_function = self._ti_compiled
+            except ImportError:
+                self.si_function = SiTiCalculator.si
 
         if self.show_histogram:
             self.verbose = True
@@ -190,6 +311,12 @@ class SiTiCalculator:
         self.si_values: List[float] = []
         self.ti_values: List[Union[float, None]] = []
 
+        # lazily built lookup tables for limited-range normalization/validation
+        # and for the full per-code transform chain
+        self._limited_range_lut: Union[np.ndarray, None] = None
+        self._limited_range_valid_lut: Union[np.ndarray, None] = None
+        self._transform_lut: Union[np.ndarray, None] = None
+
         self.last_input_file: Union[None, str] = None
 
     def get_general_settings(self) -> Dict:
@@ -222,13 +349,117 @@ class SiTiCalculator:
         """
         # TODO: check array dimensions
 
-        # calculate horizontal/vertical operators
-        sob_x = ndimage.sobel(frame_data, axis=0)
-        sob_y = ndimage.sobel(frame_data, axis=1)
+        # deferred so that importing siti_tools does not pay for scipy; this
+        # fallback path only runs when the compiled kernels are unavailable
+        from scipy import ndimage
+
+        height, _ = frame_data.shape
+        tile_rows = SiTiCalculator.SI_TILE_ROWS
+
+        if height <= tile_rows:
+            # calculate horizontal/vertical operators
+            sob_x = ndimage.sobel(frame_data, axis=0)
+            sob_y = ndimage.sobel(frame_data, axis=1)
+
+            # crop output to valid window, calculate gradient magnitude;
+            # sqrt(x^2 + y^2) vectorizes where libm hypot does not, and the
+            # float accumulation keeps integer Sobel output from overflowing
+            mag_dtype = sob_x.dtype if sob_x.dtype.kind == "f" else np.float64
+            magnitude = np.multiply(sob_x, sob_x, dtype=mag_dtype)
+            magnitude += np.multiply(sob_y, sob_y, dtype=mag_dtype)
+            np.sqrt(magnitude, out=magnitude)
+            si = magnitude[1:-1, 1:-1].std()
+            return si
+
+        # for tall frames, process horizontal strips with a one-row halo so the
+        # working set of each strip stays in cache, and stitch the strips
+        # together via partial sums of the magnitude and its square
+        total = 0.0
+        total_sq = 0.0
+        count = 0
+        for row_start in range(1, height - 1, tile_rows):
+            row_end = min(row_start + tile_rows, height - 1)
+            block = frame_data[row_start - 1 : row_end + 1]
+            sob_x = ndimage.sobel(block, axis=0)
+            sob_y = ndimage.sobel(block, axis=1)
+            mag_dtype = sob_x.dtype if sob_x.dtype.kind == "f" else np.float64
+            mag2 = np.multiply(sob_x, sob_x, dtype=mag_dtype)
+            mag2 += np.multiply(sob_y, sob_y, dtype=mag_dtype)
+            np.sqrt(mag2, out=mag2)
+            magnitude = mag2[1:-1, 1:-1]
+            total += magnitude.sum()
+            total_sq += np.square(magnitude).sum()
+            count += magnitude.size
+        mean = total / count
+        return np.sqrt(total_sq / count - mean * mean)
+
+    def _si_compiled(self, frame_data: np.ndarray) -> float:
+        """
+        Compiled-extension variant of si(), falling back to the NumPy
+        implementation for dtypes the extension does not cover.
+        """
+        from . import _sobel
 
-        # crop output to valid window, calculate gradient magnitude
-        si = np.hypot(sob_x, sob_y)[1:-1, 1:-1].std()
-        return si
+        try:
+            return _sobel.si_frame(frame_data)
+        except TypeError:
+            return SiTiCalculator.si(frame_data)
+
+    def _ti_compiled(
+        self, frame_data: np.ndarray, previous_frame_data: Optional[np.ndarray]
+    ) -> Optional[float]:
+        """
+        Compiled-extension variant of ti(), falling back to the buffered NumPy
+        implementation for dtypes the extension does not cover.
+        """
+        from . import _sobel
+
+        if previous_frame_data is None:
+            return None
+        try:
+            return _sobel.ti_frame(frame_data, previous_frame_data)
+        except TypeError:
+            return self._ti_buffered(frame_data, previous_frame_data)
+
+    def _frame_to_gpu(self, frame_data: np.ndarray):
+        """
+        Upload a frame to the GPU, reusing the device copy if this frame (or
+        the previous one, needed for TI) was uploaded already.
+        """
+        import cupy as cp
+
+        for host_frame, gpu_frame in self._gpu_frames:
+            if host_frame is frame_data:
+                return gpu_frame
+        gpu_frame = cp.asarray(frame_data)
+        self._gpu_frames = [(frame_data, gpu_frame), *self._gpu_frames[:1]]
+        return gpu_frame
+
+    def _si_cuda(self, frame_data: np.ndarray) -> float:
+        """
+        CUDA variant of si(): upload the frame, run the Sobel filters and the
+        reduction on the GPU, and download only the scalar result.
+        """
+        import cupy as cp
+        import cupyx.scipy.ndimage
+
+        frame_gpu = self._frame_to_gpu(frame_data)
+        sob_x = cupyx.scipy.ndimage.sobel(frame_gpu, axis=0)
+        sob_y = cupyx.scipy.ndimage.sobel(frame_gpu, axis=1)
+        return float(cp.hypot(sob_x, sob_y)[1:-1, 1:-1].std())
+
+    def _ti_cuda(
+        self, frame_data: np.ndarray, previous_frame_data: Optional[np.ndarray]
+    ) -> Optional[float]:
+        """
+        CUDA variant of ti(): difference and reduction run on the GPU, with
+        both frames taken from the device-side cache.
+        """
+        if previous_frame_data is None:
+            return None
+        frame_gpu = self._frame_to_gpu(frame_data)
+        previous_gpu = self._frame_to_gpu(previous_frame_data)
+        return float((frame_gpu - previous_gpu).std())
 
     @staticmethod
     def ti(
@@ -252,6 +483,23 @@ class SiTiCalculator:
         else:
             return cast(np.ndarray, frame_data - previous_frame_data).std()
 
+    def _ti_buffered(
+        self, frame_data: np.ndarray, previous_frame_data: Optional[np.ndarray]
+    ) -> Optional[float]:
+        """
+        Variant of ti() that subtracts into a reused difference buffer, so the
+        per-frame full-frame temporary of the plain version is allocated once
+        per stream instead of once per frame.
+        """
+        if previous_frame_data is None:
+            return None
+        diff_dtype = np.result_type(frame_data, previous_frame_data)
+        buf = self._ti_diff_buffer
+        if buf is None or buf.shape != frame_data.shape or buf.dtype != diff_dtype:
+            buf = self._ti_diff_buffer = np.empty(frame_data.shape, dtype=diff_dtype)
+        np.subtract(frame_data, previous_frame_data, out=buf)
+        return float(buf.std())
+
     @staticmethod
     def eotf_1886(
         frame_data: np.ndarray,
@@ -281,13 +529,15 @@ class SiTiCalculator:
         if np.max(frame_data) > 1:
             logger.warn("Input for eotf_1886() was > 1, truncating")
 
-        frame_data = np.maximum(frame_data, 0.0)
-        frame_data = np.minimum(frame_data, 1.0)
+        # single-pass clamp instead of separate maximum/minimum
+        frame_data = np.clip(frame_data, 0.0, 1.0)
 
-        a = np.power(np.power(l_max, 1.0 / gamma) - np.power(l_min, 1.0 / gamma), gamma)
-        b = np.power(l_min, 1.0 / gamma) / (
-            np.power(l_max, 1.0 / gamma) - np.power(l_min, 1.0 / gamma)
-        )
+        # math.pow: scalar powers skip the ufunc dispatch, and plain floats
+        # do not upcast float32 input
+        lmax_g = math.pow(l_max, 1.0 / gamma)
+        lmin_g = math.pow(l_min, 1.0 / gamma)
+        a = math.pow(lmax_g - lmin_g, gamma)
+        b = lmin_g / (lmax_g - lmin_g)
 
         frame_data = a * np.power(np.maximum(frame_data + b, 0), gamma)
 
@@ -310,12 +560,15 @@ class SiTiCalculator:
         if np.max(frame_data) > 1:
             logger.warn("Input for eotf_inv_srgb() was > 1, truncating")
 
-        frame_data = np.maximum(frame_data, 0.0)
-        frame_data = np.minimum(frame_data, 1.0)
+        # single-pass clamp instead of separate maximum/minimum
+        frame_data = np.clip(frame_data, 0.0, 1.0)
 
-        frame_data = (frame_data <= 0.04045) * frame_data / 12.92 + (
-            frame_data > 0.04045
-        ) * np.power((frame_data + 0.055) / 1.055, 2.4)
+        # select between the branches instead of summing the masked products
+        frame_data = np.where(
+            frame_data <= 0.04045,
+            frame_data / 12.92,
+            np.power((frame_data + 0.055) / 1.055, 2.4),
+        )
 
         return frame_data
 
@@ -371,7 +624,9 @@ class SiTiCalculator:
         c1 = 0.8359375
         c2 = 18.8515625
         c3 = 18.6875
-        lm1 = np.power(10000.0, n)
+        # math.pow: scalar powers skip the ufunc dispatch, and a plain float
+        # does not upcast float32 input
+        lm1 = math.pow(10000.0, n)
         # FIXME: this might return an error if input is negative, see https://stackoverflow.com/q/45384602/
         lm2 = np.power(frame_data, n)
 
@@ -395,55 +650,9 @@ class SiTiCalculator:
             frame_data: pixel values in the range [0, 1]
         """
 
-        if mode == "banding":
-            p = [
-                1.070275272,
-                0.4088273932,
-                0.153224308,
-                0.2520326168,
-                1.063512885,
-                1.14115047,
-                521.4527484,
-            ]
-            p_min = -1.5580e-07
-            p_max = 520.4673
-        elif mode == "banding_glare":
-            p = [
-                0.353487901,
-                0.3734658629,
-                8.277049286e-05,
-                0.9062562627,
-                0.09150303166,
-                0.9099517204,
-                596.3148142,
-            ]
-            p_min = 5.4705e-10
-            p_max = 595.3939
-        elif mode == "peaks":
-            p = [
-                1.043882782,
-                0.6459495343,
-                0.3194584211,
-                0.374025247,
-                1.114783422,
-                1.095360363,
-                384.9217577,
-            ]
-            p_min = 1.3674e-07
-            p_max = 380.9853
-        elif mode == "peaks_glare":
-            p = [
-                816.885024,
-                1479.463946,
-                0.001253215609,
-                0.9329636822,
-                0.06746643971,
-                1.573435413,
-                419.6006374,
-            ]
-            p_min = -9.7360e-08
-            p_max = 407.5066
-        else:
+        try:
+            p, p_min, p_max = SiTiCalculator.PU21_PARAMS[mode]
+        except KeyError:
             raise RuntimeError("Invalid mode specified for PU21")
 
         # scale frame_data to the range 0.005 - 10,000
@@ -451,15 +660,11 @@ class SiTiCalculator:
         # frame_data = frame_data * 10000.0
         # frame_data = np.maximum(frame_data, 0.05)
 
+        # frame_data**p[3] appears in both numerator and denominator; compute
+        # the transcendental pass once
+        xp3 = np.power(frame_data, p[3])
         frame_data = p[6] * (
-            np.power(
-                (
-                    (p[0] + p[1] * np.power(frame_data, p[3]))
-                    / (1.0 + p[2] * np.power(frame_data, p[3]))
-                ),
-                p[4],
-            )
-            - p[5]
+            np.power((p[0] + p[1] * xp3) / (1.0 + p[2] * xp3), p[4]) - p[5]
         )
 
         # get the output into the range [0, 1]
@@ -489,11 +694,14 @@ class SiTiCalculator:
         if l_max <= 1000.0:
             gamma = 1.2
         else:
-            gamma = 1.2 + 0.42 * np.log10(l_max/1000.0)
+            gamma = 1.2 + 0.42 * math.log10(l_max / 1000.0)
 
-        frame_data = (frame_data <= 0.5) * (np.power(frame_data, 2.0) / 3.0) + (
-            frame_data > 0.5
-        ) * (np.exp((frame_data - c) / a) - b)
+        # select between the branches instead of summing the masked products
+        frame_data = np.where(
+            frame_data <= 0.5,
+            np.power(frame_data, 2.0) / 3.0,
+            np.exp((frame_data - c) / a) - b,
+        )
 
         # NOTE: The following is only valid when the function is applied to the Y channel.
         # If frame_data was a color channel (R, G, or B), the correct implementation would be:
@@ -520,8 +728,12 @@ class SiTiCalculator:
     def normalize_between_0_1(self, frame_data: Union[np.ndarray, float]):
         """
         Normalize frame data in the range [0, x] to [0, 1], based on bit depth.
+
+        The result is float32: the transform chain is memory-bound, and single
+        precision halves the bytes per pixel while staying far below the SI/TI
+        comparison tolerance.
         """
-        return frame_data / (2**self.bit_depth - 1)
+        return np.divide(frame_data, 2**self.bit_depth - 1, dtype=np.float32)
 
     def add_frame_callback(
         self, callback_fn: Callable[[float, Union[float, None], int], None]
@@ -566,8 +778,161 @@ class SiTiCalculator:
 
         return frame_data
 
+    def _get_limited_range_lut(self) -> np.ndarray:
+        """
+        A lookup table mapping raw integer codes of limited-range content to
+        full-range float32 values in [0, 1].
+
+        The table fuses normalize_between_0_1 and handle_limited_range into a
+        single gather, replacing several full-frame float passes. It has one
+        entry per code of the configured bit depth and is built on first use.
+        """
+        if self._limited_range_lut is None:
+            codes = np.arange(2**self.bit_depth, dtype=np.float32)
+            normalized = codes / (2**self.bit_depth - 1)
+            self._limited_range_lut = np.clip(
+                (normalized - self.LIMITED_RANGE_MIN)
+                / (self.LIMITED_RANGE_MAX - self.LIMITED_RANGE_MIN),
+                0,
+                1,
+            ).astype(np.float32)
+        return self._limited_range_lut
+
+    def _check_limited_range_codes(self, frame_data: np.ndarray) -> None:
+        """
+        Raise if raw integer frame data exceeds the limited range, with the
+        same tolerance and error message as handle_limited_range.
+
+        Validity is a pure function of the code, so this is a single LUT
+        gather plus a boolean reduction instead of two full-frame min/max
+        scans; min/max are only computed on the error path for the message.
+        """
+        if self._limited_range_valid_lut is None:
+            normalized = np.arange(2**self.bit_depth) / (2**self.bit_depth - 1)
+            self._limited_range_valid_lut = (
+                normalized + 0.001 >= self.LIMITED_RANGE_MIN
+            ) & (normalized - 0.001 <= self.LIMITED_RANGE_MAX)
+        if not self._limited_range_valid_lut[frame_data].all():
+            input_min = np.min(frame_data) / (2**self.bit_depth - 1)
+            input_max = np.max(frame_data) / (2**self.bit_depth - 1)
+            raise RuntimeError(
+                "Input appears to be full range, but it is treated as limited range SDR! "
+                f"Input range is [{int(self.normalize_to_original_range(input_min))}-{int(self.normalize_to_original_range(input_max))}]. "
+                f"Expected range for limited content [{int(self.normalize_to_original_range(self.LIMITED_RANGE_MIN))}-{int(self.normalize_to_original_range(self.LIMITED_RANGE_MAX))}]. "
+                "Specify the range as full instead."
+            )
+
+    def _transform_frame(self, frame_data: np.ndarray, log: bool = False) -> np.ndarray:
+        """
+        Run the non-legacy transform chain on raw integer frame data:
+        normalization, range conversion, EOTF/display model and OETF,
+        according to the calculator settings.
+
+        This is also the reference that _get_transform_lut() is built from.
+
+        Args:
+            frame_data (np.ndarray): raw integer frame data
+            log (bool, optional): log frame statistics after each stage.
+                Defaults to False.
+
+        Returns:
+            np.ndarray: frame data in the OETF domain, range [0, 1]
+        """
+        if self.color_range == ColorRange.LIMITED:
+            # normalize and convert limited to full range in a single
+            # LUT gather over the raw integer codes
+            frame_data = self._get_limited_range_lut()[frame_data]
+            if log:
+                logger.debug(
+                    "Frame data after limited-range normalization between 0 and 1"
+                )
+                self._log_frame_data(frame_data)
+        else:
+            # in full range, we only have to normalize the data
+            frame_data = self.normalize_between_0_1(frame_data)
+            if log:
+                logger.debug("Frame data after normalization between 0 and 1")
+                self._log_frame_data(frame_data)
+
+        if (
+            self.jit
+            and self.hdr_mode == HdrMode.SDR
+            and self.eotf_function == EotfFunction.BT1886
+            and self.calculation_domain == CalculationDomain.PQ
+        ):
+            # fused EOTF/display/OETF kernel: one pass over the frame
+            # instead of the three-step chain below
+            from . import _kernels_numba
+
+            frame_data = _kernels_numba.sdr_pq_bt1886(
+                frame_data, self.gamma, self.l_min, self.l_max
+            )
+            if log:
+                logger.debug("Frame data after fused SDR BT.1886/PQ kernel")
+                self._log_frame_data(frame_data)
+        elif self.hdr_mode == HdrMode.SDR:
+            frame_data = SiTiCalculator.apply_display_model(
+                frame_data,
+                eotf_function=self.eotf_function,
+                l_max=self.l_max,
+                l_min=self.l_min,
+                gamma=self.gamma,
+            )
+            if log:
+                logger.debug(
+                    f"Frame data after apply_display_model for SDR ({self.l_min}, {self.l_max})"
+                )
+                self._log_frame_data(frame_data)
+            frame_data = self.oetf_function(frame_data, **self.oetf_function_kwargs)
+            if log:
+                logger.debug(
+                    f"Frame data after OETF function {self.oetf_function} with args {self.oetf_function_kwargs}"
+                )
+                self._log_frame_data(frame_data)
+        elif self.hdr_mode == HdrMode.HDR10:
+            # nothing to do, we are already in PQ domain
+            # TODO allow using Pu21 here?
+            pass
+        elif self.hdr_mode == HdrMode.HLG:
+            frame_data = SiTiCalculator.eotf_hlg(frame_data, self.l_min, self.l_max)
+            if log:
+                logger.debug(
+                    f"Frame data after eotf_hlg for HLG with l_min/l_max settings {self.l_min, self.l_max}"
+                )
+                self._log_frame_data(frame_data)
+            frame_data = self.oetf_function(frame_data, **self.oetf_function_kwargs)
+            if log:
+                logger.debug(
+                    f"Frame data after OETF function {self.oetf_function} with args {self.oetf_function_kwargs}"
+                )
+                self._log_frame_data(frame_data)
+        else:
+            raise RuntimeError(f"Invalid HDR mode '{self.hdr_mode}'")
+
+        return frame_data
+
+    def _get_transform_lut(self) -> np.ndarray:
+        """
+        An exact lookup table mapping each raw integer code of the configured
+        bit depth to its final OETF-domain value.
+
+        The per-pixel transform chain is a pure function of the code, so the
+        table replaces the chain's transcendental math (powers in the EOTF and
+        OETF) with a single gather per frame, at no loss of accuracy. Built on
+        first use by running all codes through _transform_frame().
+        """
+        if self._transform_lut is None:
+            codes = np.arange(2**self.bit_depth, dtype=np.int32).reshape(1, -1)
+            self._transform_lut = np.ascontiguousarray(
+                self._transform_frame(codes).ravel().astype(np.float32)
+            )
+        return self._transform_lut
+
     @staticmethod
     def plot_histogram(frame_data: np.ndarray) -> str:
+        # deferred import; only needed when histograms are requested
+        import plotille
+
         return plotille.histogram(
             frame_data.flatten(), bins=40, width=78, height=25, x_min=0
         )
@@ -576,6 +941,7 @@ class SiTiCalculator:
         self,
         input_file: str,
         num_frames=0,
+        hwaccel: Union[str, None] = None,
     ) -> Tuple[List[float], List[Union[float, None]], int]:
         """Calculate SI and TI from an input file.
 
@@ -588,6 +954,8 @@ class SiTiCalculator:
         Args:
             input_file (str): input file path
             num_frames (int): number of frames to calculate. Defaults to 0 (unlimited).
+            hwaccel (str, optional): hardware acceleration device type for decoding,
+                e.g. "cuda". Defaults to None (software decoding).
 
         Returns:
             [[float], [float|None], int]: [si_values], [ti_values], frame count
@@ -596,33 +964,73 @@ class SiTiCalculator:
         self.ti_values = []
         self.last_input_file = input_file
         previous_frame_data = None
+        previous_raw_frame = None
+        # two reusable output slots for the LUT gather ("ping-pong"): TI still
+        # reads the previous frame from one slot while the current frame is
+        # written into the other, so no per-frame allocation is needed
+        transform_buffers: Optional[List[np.ndarray]] = None
+        # which slot to write next; toggled on writes only, so a skipped
+        # (duplicate) frame cannot make the next write land on the slot that
+        # still holds the previous frame
+        transform_buffer_index = 0
 
         current_frame = 0
-        for frame_data in read_container(input_file):
+        # single worker, so SI overlaps with the main thread's TI per frame
+        si_executor = ThreadPoolExecutor(max_workers=1)
+        # decode in a background thread so PyAV and the NumPy math overlap
+        for frame_data in prefetch_frames(read_container(input_file, hwaccel=hwaccel)):
             self.verbose and logger.debug(f"Frame {current_frame+1}")
 
             if current_frame == 0:
                 logger.debug("Original frame data")
                 self._log_frame_data(frame_data)
 
-            # Normalize frame data according to bit depth between 0 and 1.
-            # This will transform [0, 255] to [0, 1], and [0, 1023] to [0, 1] etc.
+            if previous_raw_frame is not None and np.array_equal(
+                frame_data, previous_raw_frame
+            ):
+                # bit-identical repeat (pulldown, frozen content): SI is
+                # unchanged and TI is exactly zero, so reuse the previous
+                # result instead of re-running the whole pipeline
+                si_value = self.si_values[-1]
+                ti_value = 0.0
+                self.si_values.append(si_value)
+                self.ti_values.append(ti_value)
+                current_frame += 1
+                for callback in self.callbacks:
+                    callback(si_value, ti_value, current_frame)
+                if num_frames not in [None, 0] and current_frame >= num_frames:
+                    break
+                continue
+            previous_raw_frame = frame_data
+
+            # Normalize frame data according to bit depth between 0 and 1,
+            # and apply the EOTF/OETF transform chain.
             if not self.legacy:
-                frame_data = self.normalize_between_0_1(frame_data)
-
-                if current_frame == 0:
-                    logger.debug("Frame data after normalization between 0 and 1")
-                    self._log_frame_data(frame_data)
-
-                # convert limited to full range
                 if self.color_range == ColorRange.LIMITED:
-                    frame_data = self.handle_limited_range(frame_data)
-                    if current_frame == 0:
-                        logger.debug("Frame data after limited-range normalization")
-                        self._log_frame_data(frame_data)
+                    self._check_limited_range_codes(frame_data)
+                if current_frame == 0:
+                    # run the step-by-step chain once, with per-stage debug
+                    # logging; subsequent frames go through the code-indexed
+                    # LUT, which is built from this very chain
+                    frame_data = self._transform_frame(frame_data, log=True)
                 else:
-                    # in full range, we do not have to further process the data
-                    pass
+                    lut = self._get_transform_lut()
+                    if self.device == Device.CUDA:
+                        # the device-side cache in _frame_to_gpu is keyed on
+                        # host array identity, so rewriting a buffer in place
+                        # would alias new frames to stale uploads; give every
+                        # frame a fresh array instead
+                        frame_data = np.take(lut, frame_data)
+                    else:
+                        if transform_buffers is None:
+                            transform_buffers = [
+                                np.empty(frame_data.shape, dtype=lut.dtype),
+                                np.empty(frame_data.shape, dtype=lut.dtype),
+                            ]
+                        out = transform_buffers[transform_buffer_index]
+                        transform_buffer_index ^= 1
+                        np.take(lut, frame_data, out=out)
+                        frame_data = out
             else:
                 if self.color_range == ColorRange.LIMITED:
                     # legacy mode, apply the old way of normalizing data between 16-235
@@ -638,75 +1046,32 @@ class SiTiCalculator:
                     # in full range, we do not have to further process the data
                     pass
 
-            if not self.legacy:
-                if self.hdr_mode == HdrMode.SDR:
-                    frame_data = SiTiCalculator.apply_display_model(
-                        frame_data,
-                        eotf_function=self.eotf_function,
-                        l_max=self.l_max,
-                        l_min=self.l_min,
-                        gamma=self.gamma,
-                    )
-                    if current_frame == 0:
-                        logger.debug(
-                            f"Frame data after apply_display_model for SDR ({self.l_min}, {self.l_max})"
-                        )
-                        self._log_frame_data(frame_data)
-                    frame_data = self.oetf_function(
-                        frame_data, **self.oetf_function_kwargs
-                    )
-                    if current_frame == 0:
-                        logger.debug(
-                            f"Frame data after OETF function {self.oetf_function} with args {self.oetf_function_kwargs}"
-                        )
-                        self._log_frame_data(frame_data)
-                elif self.hdr_mode == HdrMode.HDR10:
-                    # nothing to do, we are already in PQ domain
-                    # TODO allow using Pu21 here?
-                    pass
-                elif self.hdr_mode == HdrMode.HLG:
-                    frame_data = SiTiCalculator.eotf_hlg(
-                        frame_data, self.l_min, self.l_max
-                    )
-                    if current_frame == 0:
-                        logger.debug(
-                            f"Frame data after eotf_hlg for HLG with l_min/l_max settings {self.l_min, self.l_max}"
-                        )
-                        self._log_frame_data(frame_data)
-                    frame_data = self.oetf_function(
-                        frame_data, **self.oetf_function_kwargs
-                    )
-                    if current_frame == 0:
-                        logger.debug(
-                            f"Frame data after OETF function {self.oetf_function} with args {self.oetf_function_kwargs}"
-                        )
-                        self._log_frame_data(frame_data)
-                else:
-                    raise RuntimeError(f"Invalid HDR mode '{self.hdr_mode}'")
-
-            if not self.legacy:
-                si_value = self.normalize_to_original_si_range(
-                    SiTiCalculator.si(frame_data)
-                )
-            else:
-                si_value = SiTiCalculator.si(frame_data)
+            # SI runs on the worker thread while TI runs here; both kernels
+            # release the GIL for the bulk of their work
+            si_future = si_executor.submit(self.si_function, frame_data)
             if current_frame != 0:
+                ti_raw = cast(float, self.ti_function(frame_data, previous_frame_data))
                 if not self.legacy:
-                    ti_value = self.normalize_to_original_si_range(
-                        cast(float, SiTiCalculator.ti(frame_data, previous_frame_data))
-                    )
+                    ti_value = self.normalize_to_original_si_range(ti_raw)
                 else:
-                    ti_value = SiTiCalculator.ti(frame_data, previous_frame_data)
+                    ti_value = ti_raw
             else:
+                ti_raw = None
                 ti_value = None
+            si_raw = cast(float, si_future.result())
+            if not self.legacy:
+                si_value = self.normalize_to_original_si_range(si_raw)
+            else:
+                si_value = si_raw
 
-            logger.debug(
-                f"SI value {np.around(SiTiCalculator.si(frame_data), 3)}, normalized: {np.around(self.normalize_to_original_si_range(SiTiCalculator.si(frame_data)), 3)}"
-            )
-            if ti_value is not None:
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(
-                    f"TI value {np.around(cast(float, SiTiCalculator.ti(frame_data, previous_frame_data)), 3)}, normalized: {np.around(self.normalize_to_original_si_range(cast(float, SiTiCalculator.ti(frame_data, previous_frame_data))), 3)}"
+                    f"SI value {np.around(si_raw, 3)}, normalized: {np.around(si_value, 3)}"
                 )
+                if ti_value is not None:
+                    logger.debug(
+                        f"TI value {np.around(ti_raw, 3)}, normalized: {np.around(ti_value, 3)}"
+                    )
 
             self.si_values.append(cast(float, si_value))
             if ti_value is not None:
@@ -720,20 +1085,26 @@ class SiTiCalculator:
                 callback(si_value, ti_value, current_frame)
 
             if num_frames not in [None, 0] and current_frame >= num_frames:
-                return self.si_values, self.ti_values, current_frame
+                break
 
+        si_executor.shutdown()
         return self.si_values, self.ti_values, current_frame
 
-    def get_csv_results(self) -> str:
+    def get_csv_results(self, file=None) -> str:
         """
-        Return a CSV string with the results.
+        Return a CSV string with the results, or write them directly to a
+        file-like object if one is given (avoiding the intermediate string).
 
         Note that this does not output all data. Also, the first TI value will be output as "None".
+
+        Args:
+            file (io.TextIOBase, optional): writable text file object to stream
+                the rows to. Defaults to None (return a string).
         """
         # prepend a zero here
         ti_values_to_output = [None, *self.ti_values]
 
-        output = io.StringIO()
+        output = io.StringIO() if file is None else file
         writer = csv.DictWriter(output, fieldnames=["input_file", "n", "si", "ti"])
         writer.writeheader()
         for idx, (si_value, ti_value) in enumerate(
@@ -749,6 +1120,8 @@ class SiTiCalculator:
                     "ti": np.round(ti_value, 3) if ti_value is not None else None,
                 }
             )
+        if file is not None:
+            return ""
         return output.getvalue()
 
     def get_results(self) -> Dict:
@@ -26,17 +26,27 @@
 
 import sys
 import os
-from typing import Dict, List, Tuple, Union
-from numpy import NaN
+import shutil
+from typing import Dict, Tuple, Union
+import numpy as np
 import pytest
 import requests
 from tqdm import tqdm
 from itertools import zip_longest
 import json
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-from siti_tools.file import read_container  # noqa: E402
+HERE = os.path.dirname(__file__)
+VIDEO_DIR = os.path.join(HERE, "videos")
+GROUND_TRUTH_DIR = os.path.join(HERE, "ground_truth")
+
+sys.path.insert(0, os.path.abspath(os.path.join(HERE, "..")))
+
+from siti_tools.file import prefetch_frames, read_container  # noqa: E402
 from siti_tools.siti import (
     SiTiCalculator,
     ColorRange,
@@ -79,7 +89,22 @@ def pytest_generate_tests(metafunc):
             test_siti_calculator_scenario_ids.append(scenario_id)
             scenario_kwargs = scenario_params.items()
             test_siti_calculator_argnames = [x[0] for x in scenario_kwargs]
-            test_siti_calculator_argvalues.append([x[1] for x in scenario_kwargs])
+            argvalues = [x[1] for x in scenario_kwargs]
+            # with SITI_NO_NETWORK set, skip scenarios whose video would have
+            # to be downloaded instead of timing out on the request
+            input_file = scenario_params.get("input_file", "")
+            if (
+                os.environ.get("SITI_NO_NETWORK")
+                and input_file.startswith("https:")
+                and not os.path.isfile(
+                    os.path.join(VIDEO_DIR, os.path.basename(input_file))
+                )
+            ):
+                argvalues = pytest.param(
+                    *argvalues,
+                    marks=pytest.mark.skip(reason="SITI_NO_NETWORK is set"),
+                )
+            test_siti_calculator_argvalues.append(argvalues)
 
         metafunc.parametrize(
             test_siti_calculator_argnames,
@@ -357,26 +382,29 @@ class TestSiti:
     ]
 
     @staticmethod
-    def _read_ground_truth_csv(ground_truth: str) -> List[Dict[str, float]]:
-        ret = []
-        with open(ground_truth, "r") as gtf:
-            header_read = False
-            for line in gtf.readlines():
-                if not header_read:
-                    header_read = True
-                    continue
-                line = line.strip()
-                si, ti, _ = line.split(",")
-                if ti == "" or ti == "None":
-                    ti = NaN
-                ret.append({"si": float(si), "ti": float(ti)})
-        return ret
+    def _read_ground_truth_csv(ground_truth: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Read the ground truth CSV file and return the SI and TI columns as
+        float arrays, with missing TI values (first frame) as NaN
+        """
+        data = np.genfromtxt(
+            ground_truth,
+            delimiter=",",
+            skip_header=1,
+            usecols=(0, 1),
+            missing_values="None",
+            filling_values=np.nan,
+        )
+        return data[:, 0], data[:, 1]
 
     @staticmethod
     def _read_ground_truth_json(ground_truth: str) -> Dict:
         """
         Read the ground truth JSON file and return the entire dictionary
         """
+        if orjson is not None:
+            with open(ground_truth, "rb") as gtf:
+                return orjson.loads(gtf.read())
         with open(ground_truth, "r") as gtf:
             content = json.load(gtf)
             return content
@@ -393,18 +421,47 @@ class TestSiti:
             max_download_len (int): The maximum number of bytes to download (default: None)
         """
         print(f"Downloading to {local_path} ...")
-        response = requests.get(remote_path, stream=True)
-        content_length = int(response.headers.get("content-length", 0))
+
+        # download into a .part file that survives interruptions, resuming via
+        # an HTTP Range request, and atomically rename once complete
+        part_path = local_path + ".part"
+        resume_offset = os.path.getsize(part_path) if os.path.isfile(part_path) else 0
+
+        if max_download_len is not None and resume_offset >= max_download_len:
+            os.replace(part_path, local_path)
+            return
+
+        headers = {"Range": f"bytes={resume_offset}-"} if resume_offset else {}
+        response = requests.get(remote_path, stream=True, headers=headers)
+        if resume_offset and response.status_code != 206:
+            # server ignored the range request, start over
+            resume_offset = 0
+        content_length = int(response.headers.get("content-length", 0)) + resume_offset
 
         if max_download_len is None:
             total_size_in_bytes = content_length
         else:
             total_size_in_bytes = min(content_length, max_download_len)
 
-        total_downloaded = 0
-        block_size = 1024 * 1024  # 1 MiB
-        progress_bar = tqdm(total=total_size_in_bytes, unit="iB", unit_scale=True)
-        with open(local_path, "wb") as local_file:
+        total_downloaded = resume_offset
+        block_size = 8 * 1024 * 1024  # 8 MiB
+        progress_bar = tqdm(
+            total=total_size_in_bytes,
+            initial=resume_offset,
+            unit="iB",
+            unit_scale=True,
+            # no point in rendering a progress bar into a CI log
+            disable=(not sys.stderr.isatty()) or bool(os.environ.get("CI")),
+        )
+        with open(part_path, "ab" if resume_offset else "wb") as local_file:
+            if max_download_len is None and progress_bar.disable:
+                # no byte cap to enforce and no bar to service, so the whole
+                # body can be copied in C without a per-chunk Python loop
+                response.raw.decode_content = True
+                shutil.copyfileobj(response.raw, local_file, block_size)
+                progress_bar.close()
+                os.replace(part_path, local_path)
+                return
             for data in response.iter_content(block_size):
                 progress_bar.update(len(data))
                 total_downloaded += len(data)
@@ -418,21 +475,18 @@ class TestSiti:
                     )
                     break
         progress_bar.close()
+        os.replace(part_path, local_path)
 
     @staticmethod
     def _download_file_if_needed(input_file: str, max_download_len: Union[int, None] = None):
         """
         Check if a local file already exists for the given URL; if not, download it
         """
-        input_file_path = os.path.join(os.path.dirname(__file__), "videos", input_file)
-        if not os.path.isfile(input_file_path) and input_file.startswith("https:"):
-            local_path = os.path.join(
-                os.path.dirname(__file__), "videos", os.path.basename(input_file_path)
+        local_path = os.path.join(VIDEO_DIR, os.path.basename(input_file))
+        if not os.path.isfile(local_path) and input_file.startswith("https:"):
+            TestSiti._try_download_file(
+                input_file, local_path, max_download_len=max_download_len
             )
-            if not os.path.isfile(local_path):
-                TestSiti._try_download_file(
-                    input_file, local_path, max_download_len=max_download_len
-                )
 
     def test_siti_calculator(
         self,
@@ -454,29 +508,27 @@ class TestSiti:
         print(f"Testing {input_file}")
         TestSiti._download_file_if_needed(input_file, max_download_len)
 
-        ground_truth_path = os.path.join(
-            os.path.dirname(__file__), "ground_truth", ground_truth
-        )
+        ground_truth_path = os.path.join(GROUND_TRUTH_DIR, ground_truth)
         gt = TestSiti._read_ground_truth_json(ground_truth_path)
 
         print(f"Ground truth: {gt}")
 
-        input_file_path = os.path.join(
-            os.path.dirname(__file__), "videos", os.path.basename(input_file)
-        )
+        input_file_path = os.path.join(VIDEO_DIR, os.path.basename(input_file))
         calculator = SiTiCalculator(**siti_calculator_kwargs)
         si_values, ti_values, _ = calculator.calculate(input_file_path)
 
         # we require one more SI value than TI values, since first frame is not defined
         assert len(si_values) == len(ti_values) + 1
 
-        for frame_idx, (si_value, si_gt) in enumerate(zip(si_values, gt["si"])):
-            print(f"Frame {frame_idx+1}, SI {si_value}, Ground Truth {si_gt}")
-            assert pytest.approx(si_value, 0.01) == si_gt
+        # one vectorized comparison per metric instead of a pytest.approx
+        # object per frame; truncate to the shorter side as zip() used to
+        n_si = min(len(si_values), len(gt["si"]))
+        print(f"SI values: {si_values[:n_si]}")
+        np.testing.assert_allclose(si_values[:n_si], gt["si"][:n_si], rtol=0.01)
 
-        for frame_idx, (ti_value, ti_gt) in enumerate(zip(ti_values, gt["ti"])):
-            print(f"Frame {frame_idx+1}, TI {ti_value}, Ground Truth {ti_gt}")
-            assert pytest.approx(ti_value, 0.01) == ti_gt
+        n_ti = min(len(ti_values), len(gt["ti"]))
+        print(f"TI values: {ti_values[:n_ti]}")
+        np.testing.assert_allclose(ti_values[:n_ti], gt["ti"][:n_ti], rtol=0.01)
 
     def test_siti_main_functions(self, input_file: str, ground_truth: str):
         """
@@ -492,32 +544,33 @@ class TestSiti:
         print(f"Testing {input_file}")
         TestSiti._download_file_if_needed(input_file)
 
-        input_file_path = os.path.join(os.path.dirname(__file__), "videos", input_file)
-        frame_generator = read_container(input_file_path)
+        input_file_path = os.path.join(VIDEO_DIR, input_file)
+        # decode in a background thread, as the calculator does
+        frame_generator = prefetch_frames(read_container(input_file_path))
 
-        ground_truth_path = os.path.join(
-            os.path.dirname(__file__), "ground_truth", ground_truth
-        )
-        gt = TestSiti._read_ground_truth_csv(ground_truth_path)
-
-        frame_cnt = 1
+        ground_truth_path = os.path.join(GROUND_TRUTH_DIR, ground_truth)
+        gt_si, gt_ti = TestSiti._read_ground_truth_csv(ground_truth_path)
 
+        si_list = []
+        ti_list = []
         previous_frame_data = None
-        for frame_data, gt_data in zip(frame_generator, gt):
-            si_value = SiTiCalculator.si(frame_data)
+        for frame_data, _ in zip(frame_generator, gt_si):
+            si_list.append(SiTiCalculator.si(frame_data))
             ti_value = SiTiCalculator.ti(frame_data, previous_frame_data)
+            ti_list.append(np.nan if ti_value is None else ti_value)
+            previous_frame_data = frame_data
 
-            print(f"Frame {frame_cnt}: SI {si_value}, {ti_value}")
-            print(f"Ground truth: {gt_data}")
-
-            assert pytest.approx(si_value, 0.01) == gt_data["si"]
+        frame_cnt = len(si_list)
+        print(f"SI values: {si_list}")
+        print(f"TI values: {ti_list}")
 
-            if frame_cnt == 1:
-                assert ti_value is None
-            else:
-                assert pytest.approx(ti_value, 0.01) == gt_data["ti"]
+        # first frame has no TI; NaN compares equal to the NaN in the ground
+        # truth below
+        assert np.isnan(ti_list[0])
 
-            previous_frame_data = frame_data
-            frame_cnt += 1
+        # one vectorized comparison per metric instead of a pytest.approx
+        # object per frame
+        np.testing.assert_allclose(si_list, gt_si[:frame_cnt], rtol=0.01)
+        np.testing.assert_allclose(ti_list, gt_ti[:frame_cnt], rtol=0.01)
 
         print(f"Frames tested: {frame_cnt}")
@@ -2,10 +2,16 @@
 #
 # Verify output of PyAV with limited/full range content
 import glob
+import os
+import sys
 
 import av
 import numpy as np
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from siti_tools.file import prefetch_frames  # noqa: E402
+
 
 # generate with:
 # ffmpeg -y -f lavfi -i testsrc=size=320x240 -filter:v "scale=in_range=limited:out_range=limited,signalstats,metadata=mode=print" -frames:v 3 -pix_fmt yuv420p videos/limited-range.y4m
@@ -25,20 +31,29 @@ def decode_and_print(input_file, bitdepth=8):
 
     if bitdepth == 8:
         datatype = np.uint8
+        bytes_per_pixel = 1
     elif bitdepth > 8:
         datatype = np.uint16
+        bytes_per_pixel = 2
     else:
         raise RuntimeError
 
-    for idx, frame in enumerate(container.decode(video=0)):
-        frame_data = (
-            np.frombuffer(frame.planes[0], datatype)
-            .reshape(frame.height, frame.width)
-            .astype("int")
-            # useful_array(frame.planes[0])
-        )
+    def frames():
+        for frame in container.decode(video=0):
+            # keep the native uint8/uint16 view; min/max need no widening and
+            # the compact dtype keeps the reductions in NumPy's vectorized loops
+            yield (
+                frame.width,
+                frame.height,
+                useful_array(frame.planes[0], bytes_per_pixel)
+                .view(datatype)
+                .reshape(frame.height, frame.width),
+            )
+
+    # decode in a background thread so libavcodec overlaps with the reductions
+    for idx, (width, height, frame_data) in enumerate(prefetch_frames(frames())):
         print(
-            f"frame {idx} ({frame.width}x{frame.height}) -- min: {np.min(frame_data)}, max: {np.max(frame_data)}"
+            f"frame {idx} ({width}x{height}) -- min: {np.min(frame_data)}, max: {np.max(frame_data)}"
         )
     print()
 
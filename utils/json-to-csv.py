@@ -53,6 +53,11 @@ import csv
 import os
 import argparse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def main():
     parser = argparse.ArgumentParser(description="Convert JSON to CSV")
@@ -60,19 +65,30 @@ def main():
     parser.add_argument("output", help="output CSV file")
     args = parser.parse_args()
 
-    with open(args.input, "r") as f:
-        data = json.load(f)
+    if orjson is not None:
+        with open(args.input, "rb") as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(args.input, "r") as f:
+            data = json.load(f)
 
     # insert an empty element at index 0 of ti
     data["ti"].insert(0, None)
 
+    input_file = os.path.basename(data["input_file"])
+
     with open(args.output, "w") as f:
         writer = csv.writer(f)
         writer.writerow(["input_file", "n", "si", "ti"])
-        for i in range(len(data["si"])):
-            si = round(data["si"][i], 3)
-            ti = round(data["ti"][i], 3) if data["ti"][i] is not None else None
-            writer.writerow([os.path.basename(data["input_file"]), i + 1, si, ti])
+        writer.writerows(
+            (
+                input_file,
+                i + 1,
+                round(si, 3),
+                round(ti, 3) if ti is not None else None,
+            )
+            for i, (si, ti) in enumerate(zip(data["si"], data["ti"]))
+        )
 
 
 if __name__ == "__main__":